@@ -0,0 +1,58 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+# 单文件sqlite缓存，供utils里的yfinance调用使用
+# 与cache.py的FileCache互补：这里缓存的是短TTL的行情类数据
+_DB_PATH = os.path.join('.cache', 'yf_cache.sqlite3')
+
+_lock = threading.Lock()
+_conn = None
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(_DB_PATH), exist_ok=True)
+        # Streamlit/线程池会跨线程调用，关闭同线程检查，用锁串行化写入
+        _conn = sqlite3.connect(_DB_PATH, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, ts REAL, blob BLOB)"
+        )
+        _conn.commit()
+    return _conn
+
+
+def get_or_fetch(key, ttl, fn, force=False):
+    """
+    命中且未过期直接返回缓存值，否则执行fn()并写入
+    force=True时跳过读取直接拉取新数据（仍会写回，供后续命中）
+    缓存层任何异常都降级为直接调用fn，不影响主流程
+    """
+    if not force:
+        try:
+            conn = _get_conn()
+            with _lock:
+                row = conn.execute("SELECT ts, blob FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and time.time() - row[0] <= ttl:
+                return pickle.loads(row[1])
+        except Exception as e:
+            print(f"Cache read error for {key}: {e}")
+
+    result = fn()
+
+    if result is not None:
+        try:
+            conn = _get_conn()
+            with _lock:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, ts, blob) VALUES (?, ?, ?)",
+                    (key, time.time(), pickle.dumps(result)),
+                )
+                conn.commit()
+        except Exception as e:
+            print(f"Cache write error for {key}: {e}")
+
+    return result
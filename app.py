@@ -1,10 +1,119 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import utils
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import re
+import os
+import json
+import threading
+from cache import FileCache
+
+def _persist_details(stock_info_list):
+    """后台持久化股票详情: 先写临时文件再原子替换，避免写一半被读到"""
+    try:
+        tmp_path = 'stock_details.json.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'stocks': stock_info_list}, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_path, 'stock_details.json')
+    except Exception as e:
+        print(f"Error saving stock details: {e}")
+
+# 预编译代码分隔正则，避免每次rerun重复查内部LRU
+_TICKER_SPLIT_RE = re.compile(r'[,\s\n]+')
+
+# 磁盘缓存：跨rerun/跨进程复用Yahoo数据，TTL按数据更新节奏设置
+_file_cache = FileCache()
+
+def get_stock_info_cached(ticker):
+    return _file_cache.get_or_fetch(ticker, 'info', lambda: utils.get_stock_info(ticker))
+
+def get_holders_data_cached(ticker):
+    return _file_cache.get_or_fetch(ticker, 'holders', lambda: utils.get_holders_data(ticker))
+
+def get_news_cached(ticker):
+    return _file_cache.get_or_fetch(ticker, 'news', lambda: utils.get_news(ticker))
+
+def search_stock_sina_cached(query):
+    return _file_cache.get_or_fetch(query, 'search', lambda: utils.search_stock_sina(query))
+
+# 模块级定义保证缓存跨rerun生效；参数用tuple便于哈希
+@st.cache_data(ttl=3600)
+def fetch_names_batch(ticker_tuple):
+    return utils.get_stock_names_sina(list(ticker_tuple))
+
+# 指标计算用 (ticker, period, interval, 行数, 末行时间戳) 做代理键，
+# 避免对整个DataFrame做哈希；_df前缀让Streamlit跳过该参数
+@st.cache_data(ttl=300, max_entries=32)
+def _compute_indicators(ticker, period, interval, n_rows, last_ts, _df):
+    return utils.calculate_technical_indicators(_df)
+
+# 翻译结果按文本记忆化：同一字符串 (机构名、职位、标题) 只走一次网络
+translate_cached = st.cache_data(ttl=86400 * 30)(utils.translate_text)
+# 批量版：去重后合并为一次translate_batch请求，整组结果随输入列表缓存
+translate_many_cached = st.cache_data(ttl=86400 * 30)(utils.translate_many)
+
+# 汇率变动很慢，1小时TTL足够；避免CNY模式下每次rerun都发HTTP
+@st.cache_data(ttl=3600)
+def _fx(from_currency, to_currency):
+    return utils.get_exchange_rate(from_currency, to_currency)
+
+# Tab 2整套行情数据缓存2分钟：无关rerun (翻译开关、搜索框等) 不再触发N次网络请求
+@st.cache_data(ttl=120)
+def _build_quotes(tickers_tuple, exchange_rate):
+    tickers = list(tickers_tuple)
+
+    # 历史数据走一次批量下载；info经fetch_many按ticker并发 (有磁盘缓存兜底)
+    with ThreadPoolExecutor(max_workers=1) as ex:
+        hist_future = ex.submit(utils.get_stock_data_multi, tickers, "1mo")
+        info_map = utils.fetch_many(tickers, get_stock_info_cached, max_workers=16)
+        data_map = hist_future.result()
+
+    quotes_data = []
+    for t in tickers:
+        d = data_map.get(t)
+        info = info_map.get(t) or {}
+
+        if d is not None and not d.empty:
+            last_price = d['Close'].iloc[-1]
+            start_price = d['Close'].iloc[0] # 1mo ago price approx
+            prev_close = d['Close'].iloc[-2] # Yesterday close
+
+            day_change = last_price - prev_close
+            day_pct = (day_change / prev_close) * 100
+
+            month_pct = (last_price - start_price) / start_price * 100
+
+            name = info.get('shortName', t)
+
+            quotes_data.append({
+                "代码": t,
+                "名称": name,
+                "最新价": last_price * exchange_rate,
+                "日涨跌": day_change * exchange_rate,
+                "日涨跌幅%": day_pct,
+                "月涨跌幅%": month_pct,
+                "成交量": d['Volume'].iloc[-1]
+            })
+
+    return quotes_data
+
+# 柱状图本身也缓存：同样的数据不重复构建Figure
+@st.cache_data(ttl=120)
+def _pct_bar_fig(codes, pcts, title):
+    pcts_arr = np.asarray(pcts)
+    fig = go.Figure(go.Bar(
+        x=list(codes),
+        y=pcts_arr,
+        text=[f"{x:.2f}%" for x in pcts],
+        textposition='auto',
+        marker_color=np.where(pcts_arr > 0, 'green', 'red').tolist()
+    ))
+    fig.update_layout(title=title, yaxis_title="涨跌幅 (%)")
+    return fig
 
 # 页面配置
 st.set_page_config(
@@ -46,7 +155,7 @@ with st.sidebar:
             st.session_state.ticker_input = new_input
             st.session_state.new_ticker = code # Mark for default selection
             # Save to JSON
-            raw_tickers = re.split(r'[,\s\n]+', new_input)
+            raw_tickers = _TICKER_SPLIT_RE.split(new_input)
             tickers = [t.strip() for t in raw_tickers if t.strip()]
             utils.save_tickers_to_json(tickers)
 
@@ -55,7 +164,7 @@ with st.sidebar:
     search_query = st.text_input("输入中文名称搜索 (如: 腾讯)", key="search_box")
     if search_query:
         with st.spinner("搜索中..."):
-            results = utils.search_stock_sina(search_query)
+            results = search_stock_sina_cached(search_query)
             if results:
                 st.write(f"找到 {len(results)} 个结果:")
                 for name, code in results[:5]: # Show top 5
@@ -81,47 +190,49 @@ with st.sidebar:
     exchange_rate = 1.0
     if currency_code == "CNY":
         with st.spinner("获取汇率中..."):
-            exchange_rate = utils.get_exchange_rate("HKD", "CNY")
+            exchange_rate = _fx("HKD", "CNY")
         st.caption(f"当前汇率 HKD/CNY: {exchange_rate:.4f}")
 
     user_tickers = st.text_area("输入股票代码 (空格或逗号分隔)", key="ticker_input", help="例如: 0700 9988 1810")
     
     # 处理输入的股票代码 (支持空格、逗号、换行)
-    raw_tickers = re.split(r'[,\s\n]+', user_tickers)
+    raw_tickers = _TICKER_SPLIT_RE.split(user_tickers)
     tickers = [t.strip() for t in raw_tickers if t.strip()]
-    
-    # Save to JSON whenever tickers change (simple approach: save on every rerun if different from file)
-    # Or just save current tickers
+
+    # 中文名称映射：侧边栏和Tab 1共用同一份缓存结果
+    name_map = fetch_names_batch(tuple(tickers)) if tickers else {}
+
+
+    # 只有列表真正变化时才写盘，避免每次rerun重写同样的文件
     if tickers:
-        utils.save_tickers_to_json(tickers)
+        tickers_hash = hash(tuple(tickers))
+        if st.session_state.get('_tickers_hash') != tickers_hash:
+            utils.save_tickers_to_json(tickers)
+            st.session_state._tickers_hash = tickers_hash
     
     # 股票列表展示
     if tickers:
         with st.expander("📋 已选股票列表", expanded=False):
-            # Use cached sina name fetching
-            @st.cache_data(ttl=3600)
-            def fetch_names_batch(ticker_list):
-                return utils.get_stock_names_sina(ticker_list)
-                
-            name_map = fetch_names_batch(tickers)
-            
+            # expander收起时Python代码照样执行，用checkbox显式控制，
+            # 未勾选就跳过DataFrame构建和JSON落盘
+            show_stock_list = st.checkbox("显示列表详情", value=False, key="_expander_open")
             stock_info_list = []
-            for t in tickers:
-                name = name_map.get(t, t)
-                # If Sina failed (English name only), fallback to yfinance logic later or just use code
-                stock_info_list.append({"代码": t, "名称": name})
-            
+            if show_stock_list:
+                for t in tickers:
+                    name = name_map.get(t, t)
+                    # If Sina failed (English name only), fallback to yfinance logic later or just use code
+                    stock_info_list.append({"代码": t, "名称": name})
+
             if stock_info_list:
                 st.dataframe(pd.DataFrame(stock_info_list), hide_index=True, use_container_width=True)
                 
                 # Save detailed info to JSON as well (as requested)
                 # We do this here because we already have the info loaded
-                try:
-                    import json
-                    with open('stock_details.json', 'w', encoding='utf-8') as f:
-                        json.dump({'stocks': stock_info_list}, f, indent=4, ensure_ascii=False)
-                except:
-                    pass
+                # 同样按内容哈希判断，没变就不写；写盘放到后台线程，不阻塞渲染
+                details_hash = hash(tuple((d["代码"], d["名称"]) for d in stock_info_list))
+                if st.session_state.get('_details_hash') != details_hash:
+                    threading.Thread(target=_persist_details, args=(stock_info_list,), daemon=True).start()
+                    st.session_state._details_hash = details_hash
 
     col_period, col_interval = st.columns(2)
     with col_period:
@@ -144,7 +255,7 @@ with st.sidebar:
     st.markdown("---")
     st.markdown("### 关于系统")
     st.info(
-        "本系统基于 yfinance 和 ta 库构建。\n"
+        "本系统基于 yfinance 构建。\n"
         "提供港股实时行情、技术指标分析及投资组合概览。"
     )
 
@@ -168,15 +279,9 @@ with tab1:
     ticker_options = tickers
     ticker_display_map = {}
     
-    # Try to reuse the name_map from sidebar if available, otherwise fetch again (cached)
-    if 'name_map' in locals():
-        current_name_map = name_map
-    else:
-        current_name_map = utils.get_stock_names_sina(tickers)
-        
     ticker_options_display = []
     for t in tickers:
-        n = current_name_map.get(t, t)
+        n = name_map.get(t, t)
         display = f"{t} - {n}"
         ticker_options_display.append(display)
         ticker_display_map[display] = t
@@ -200,17 +305,26 @@ with tab1:
         with col_title:
             st.write(f"正在分析: **{selected_ticker}**")
         with col_refresh:
-            if st.button("🔄 刷新数据", key="refresh_individual"):
-                st.rerun()
+            # 点击后本次rerun以force=True拉取，绕过sqlite历史数据缓存
+            force_refresh = st.button("🔄 刷新数据", key="refresh_individual")
 
         with st.spinner(f"正在加载 {selected_ticker} 数据..."):
-            # 获取数据 (尝试获取最新实时数据)
-            df = utils.get_stock_data(selected_ticker, period, interval)
-            info = utils.get_stock_info(selected_ticker)
-            
-            # 获取实时价格 (额外请求一次 1d/1m 数据以确保实时性)
-            # 如果主数据已经是 1d 或更短，且是最近的，其实可以复用
-            realtime_price_data = utils.get_stock_data(selected_ticker, period="1d", interval="1m")
+            # 三个独立网络请求并发发出，总耗时从3个RTT降到约1个RTT
+            # 主数据本身就是当天分钟线时，直接复用，省掉一次实时请求
+            reuse_main_as_realtime = interval == "1m" and period in ("1d", "5d")
+
+            with ThreadPoolExecutor(max_workers=3) as ex:
+                f_df = ex.submit(utils.get_stock_data, selected_ticker, period, interval,
+                                 force=force_refresh)
+                f_info = ex.submit(get_stock_info_cached, selected_ticker)
+                # 获取实时价格 (额外请求一次 1d/1m 数据以确保实时性)
+                f_rt = None
+                if not reuse_main_as_realtime:
+                    f_rt = ex.submit(utils.get_stock_data, selected_ticker, "1d", "1m",
+                                     force=force_refresh)
+                df = f_df.result()
+                info = f_info.result()
+                realtime_price_data = df if reuse_main_as_realtime else f_rt.result()
             
             if df is not None and not df.empty:
                 # Use realtime data for current price if available and newer
@@ -234,8 +348,11 @@ with tab1:
                 display_price = current_price * exchange_rate
                 display_change = change * exchange_rate
                 
-                # 计算指标
-                df = utils.calculate_technical_indicators(df)
+                # 计算指标 (代理键命中时直接复用上次的结果)
+                df = _compute_indicators(
+                    selected_ticker, period, interval,
+                    len(df), df.index[-1].value, df
+                )
 
                 # 显示基本信息
                 col1, col2, col3, col4 = st.columns(4)
@@ -251,32 +368,41 @@ with tab1:
                     pe = info.get('trailingPE', 'N/A')
                     st.metric("市盈率 (PE)", f"{pe:.2f}" if isinstance(pe, (int, float)) else pe)
                 
+                # 超过500根K线时等距抽样绘图，图表JSON体积按比例下降
+                # (分析结论仍基于完整df计算)
+                if len(df) > 500:
+                    k = max(1, len(df) // 500)
+                    # 从末端锚定抽样，保证最新一根K线一定入图
+                    df_plot = df.iloc[::-1].iloc[::k].iloc[::-1]
+                else:
+                    df_plot = df
+
                 # 绘制K线图和技术指标
-                fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
+                fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
                                     vertical_spacing=0.03, subplot_titles=(f'{selected_ticker} K线图 & 布林带 & 均线', 'RSI & MACD'), 
                                     row_width=[0.2, 0.7])
 
                 # Candlestick
-                fig.add_trace(go.Candlestick(x=df.index,
-                                open=df['Open'],
-                                high=df['High'],
-                                low=df['Low'],
-                                close=df['Close'],
+                fig.add_trace(go.Candlestick(x=df_plot.index.values,
+                                open=df_plot['Open'].values,
+                                high=df_plot['High'].values,
+                                low=df_plot['Low'].values,
+                                close=df_plot['Close'].values,
                                 name='K线'), row=1, col=1)
                 
                 # Bollinger Bands
-                fig.add_trace(go.Scatter(x=df.index, y=df['BB_High'], line=dict(color='gray', width=1, dash='dash'), name='布林带上轨'), row=1, col=1)
-                fig.add_trace(go.Scatter(x=df.index, y=df['BB_Low'], line=dict(color='gray', width=1, dash='dash'), name='布林带下轨', fill='tonexty'), row=1, col=1)
+                fig.add_trace(go.Scatter(x=df_plot.index.values, y=df_plot['BB_High'].values, line=dict(color='gray', width=1, dash='dash'), name='布林带上轨'), row=1, col=1)
+                fig.add_trace(go.Scatter(x=df_plot.index.values, y=df_plot['BB_Low'].values, line=dict(color='gray', width=1, dash='dash'), name='布林带下轨', fill='tonexty'), row=1, col=1)
                 
                 # MA Lines
-                fig.add_trace(go.Scatter(x=df.index, y=df['SMA_20'], line=dict(color='orange', width=1), name='20日均线'), row=1, col=1)
-                fig.add_trace(go.Scatter(x=df.index, y=df['SMA_50'], line=dict(color='blue', width=1), name='50日均线'), row=1, col=1)
+                fig.add_trace(go.Scatter(x=df_plot.index.values, y=df_plot['SMA_20'].values, line=dict(color='orange', width=1), name='20日均线'), row=1, col=1)
+                fig.add_trace(go.Scatter(x=df_plot.index.values, y=df_plot['SMA_50'].values, line=dict(color='blue', width=1), name='50日均线'), row=1, col=1)
 
                 # RSI (Optional, putting MACD here instead or separate)
                 # Let's put MACD in the second row
-                fig.add_trace(go.Bar(x=df.index, y=df['MACD_Diff'], name='MACD柱', marker_color='grey'), row=2, col=1)
-                fig.add_trace(go.Scatter(x=df.index, y=df['MACD'], name='MACD线', line=dict(color='purple')), row=2, col=1)
-                fig.add_trace(go.Scatter(x=df.index, y=df['MACD_Signal'], name='信号线', line=dict(color='orange')), row=2, col=1)
+                fig.add_trace(go.Bar(x=df_plot.index.values, y=df_plot['MACD_Diff'].values, name='MACD柱', marker_color='grey'), row=2, col=1)
+                fig.add_trace(go.Scatter(x=df_plot.index.values, y=df_plot['MACD'].values, name='MACD线', line=dict(color='purple')), row=2, col=1)
+                fig.add_trace(go.Scatter(x=df_plot.index.values, y=df_plot['MACD_Signal'].values, name='信号线', line=dict(color='orange')), row=2, col=1)
 
                 fig.update_layout(xaxis_rangeslider_visible=False, height=700)
                 st.plotly_chart(fig, use_container_width=True, key="technical_chart")
@@ -284,15 +410,19 @@ with tab1:
                 # 增强版智能趋势分析
                 st.subheader("🤖 AI 智能趋势深度解析")
                 
-                last_close = df['Close'].iloc[-1]
-                prev_close = df['Close'].iloc[-2]
-                sma20 = df['SMA_20'].iloc[-1]
-                sma50 = df['SMA_50'].iloc[-1]
-                rsi = df['RSI'].iloc[-1]
-                macd = df['MACD'].iloc[-1]
-                macd_signal = df['MACD_Signal'].iloc[-1]
-                bb_high = df['BB_High'].iloc[-1]
-                bb_low = df['BB_Low'].iloc[-1]
+                # 一次性取出最后两行快照，避免十几次pandas索引开销
+                last = df.iloc[-1].to_dict()
+                prev = df.iloc[-2].to_dict() if len(df) > 1 else last
+
+                last_close = last['Close']
+                prev_close = prev['Close']
+                sma20 = last['SMA_20']
+                sma50 = last['SMA_50']
+                rsi = last['RSI']
+                macd = last['MACD']
+                macd_signal = last['MACD_Signal']
+                bb_high = last['BB_High']
+                bb_low = last['BB_Low']
                 
                 analysis_points = []
                 
@@ -340,12 +470,13 @@ with tab1:
                 analysis_points.append(f"**📊 动能指标:** RSI为 {rsi:.1f} ({rsi_status})。MACD呈现 {macd_status}，{macd_desc}")
 
                 # 4. 综合建议
-                score = 0
-                if last_close > sma20: score += 1
-                if last_close > sma50: score += 1
-                if rsi < 70 and rsi > 40: score += 1
-                if macd > macd_signal: score += 1
-                if last_close > prev_close: score += 0.5
+                # 布尔直接当0/1相加，免去逐项if分支
+                score = sum((
+                    last_close > sma20,
+                    last_close > sma50,
+                    40 < rsi < 70,
+                    macd > macd_signal,
+                )) + 0.5 * (last_close > prev_close)
                 
                 recommendation = ""
                 if score >= 4:
@@ -364,7 +495,7 @@ with tab1:
                     summary = info['longBusinessSummary']
                     if enable_translation:
                         with st.spinner("正在翻译公司简介..."):
-                            summary = utils.translate_text(summary)
+                            summary = translate_cached(summary)
                     
                     with st.expander("查看详细简介", expanded=True):
                         st.write(summary)
@@ -376,7 +507,7 @@ with tab1:
                 
                 # 提取分析师数据
                 target_mean = info.get('targetMeanPrice')
-                current_price_raw = df['Close'].iloc[-1]
+                current_price_raw = last_close
                 
                 rec_key_raw = info.get('recommendationKey', 'N/A').replace('_', ' ').upper()
                 rec_map = {
@@ -453,271 +584,258 @@ with tab1:
 
 # --- Tab 2: 投资组合概览 ---
 with tab2:
-    st.subheader(f"📊 实时行情与组合对比 ({currency_code})")
-    
-    # Auto-refresh or manual refresh
-    if st.button("🔄 刷新行情"):
-        st.rerun()
-
-    quotes_data = []
-    # Use progress bar for better UX
-    progress_bar = st.progress(0)
-    
-    for i, t in enumerate(tickers):
-        # Fetch 1 month data to calculate change
-        d = utils.get_stock_data(t, period="1mo") 
-        info = utils.get_stock_info(t)
-        
-        if d is not None and not d.empty:
-            last_price = d['Close'].iloc[-1]
-            start_price = d['Close'].iloc[0] # 1mo ago price approx
-            prev_close = d['Close'].iloc[-2] # Yesterday close
-            
-            day_change = last_price - prev_close
-            day_pct = (day_change / prev_close) * 100
-            
-            month_pct = (last_price - start_price) / start_price * 100
-            
-            name = info.get('shortName', t)
-            
-            quotes_data.append({
-                "代码": t,
-                "名称": name,
-                "最新价": last_price * exchange_rate,
-                "日涨跌": day_change * exchange_rate,
-                "日涨跌幅%": day_pct,
-                "月涨跌幅%": month_pct,
-                "成交量": d['Volume'].iloc[-1]
-            })
-        progress_bar.progress((i + 1) / len(tickers))
-    
-    progress_bar.empty()
+    # 未载入前不执行本Tab的网络与计算，切换其他控件不再触发无谓开销
+    if not st.session_state.get('tab2_loaded'):
+        if st.button('📥 载入组合概览', key='tab2_loaded_btn'):
+            st.session_state.tab2_loaded = True
+            st.rerun()
+    else:
+        st.subheader(f"📊 实时行情与组合对比 ({currency_code})")
     
-    if quotes_data:
-        quotes_df = pd.DataFrame(quotes_data)
-        
-        # Style the dataframe
-        def color_change(val):
-            color = 'green' if val > 0 else 'red' if val < 0 else 'black'
-            return f'color: {color}'
-
-        st.dataframe(
-            quotes_df.style.format({
-                "最新价": "{:.2f}", 
-                "日涨跌": "{:.2f}",
-                "日涨跌幅%": "{:.2f}%", 
-                "月涨跌幅%": "{:.2f}%",
-                "成交量": "{:,.0f}"
-            }).map(color_change, subset=['日涨跌', '日涨跌幅%', '月涨跌幅%']),
-            use_container_width=True
-        )
+        # Auto-refresh or manual refresh
+        if st.button("🔄 刷新行情"):
+            _build_quotes.clear()
+            st.rerun()
+
+        with st.spinner("正在载入组合行情..."):
+            quotes_data = _build_quotes(tuple(tickers), exchange_rate)
+
+        if quotes_data:
+            quotes_df = pd.DataFrame(quotes_data)
+
+            # 用column_config让前端原生渲染数字格式，
+            # 省掉Styler对每个单元格的Python回调
+            st.dataframe(
+                quotes_df,
+                use_container_width=True,
+                column_config={
+                    "最新价": st.column_config.NumberColumn(format="%.2f"),
+                    "日涨跌": st.column_config.NumberColumn(format="%+.2f"),
+                    "日涨跌幅%": st.column_config.NumberColumn(format="%+.2f%%"),
+                    "月涨跌幅%": st.column_config.NumberColumn(format="%+.2f%%"),
+                    "成交量": st.column_config.NumberColumn(format="%d"),
+                },
+            )
         
-        # Bar chart for comparison
-        st.subheader("📈 涨跌幅对比")
-        col_chart1, col_chart2 = st.columns(2)
+            # Bar chart for comparison
+            st.subheader("📈 涨跌幅对比")
+            col_chart1, col_chart2 = st.columns(2)
         
-        with col_chart1:
-            fig_day = go.Figure(go.Bar(
-                x=quotes_df['代码'],
-                y=quotes_df['日涨跌幅%'],
-                text=quotes_df['日涨跌幅%'].apply(lambda x: f"{x:.2f}%"),
-                textposition='auto',
-                marker_color=['green' if x > 0 else 'red' for x in quotes_df['日涨跌幅%']]
-            ))
-            fig_day.update_layout(title="今日涨跌幅 (%)", yaxis_title="涨跌幅 (%)")
-            st.plotly_chart(fig_day, use_container_width=True, key="chart_day")
-            
-        with col_chart2:
-            fig_month = go.Figure(go.Bar(
-                x=quotes_df['代码'],
-                y=quotes_df['月涨跌幅%'],
-                text=quotes_df['月涨跌幅%'].apply(lambda x: f"{x:.2f}%"),
-                textposition='auto',
-                marker_color=['green' if x > 0 else 'red' for x in quotes_df['月涨跌幅%']]
-            ))
-            fig_month.update_layout(title="本月涨跌幅 (%)", yaxis_title="涨跌幅 (%)")
-            st.plotly_chart(fig_month, use_container_width=True, key="chart_month")
+            with col_chart1:
+                fig_day = _pct_bar_fig(tuple(quotes_df['代码']), tuple(quotes_df['日涨跌幅%']), "今日涨跌幅 (%)")
+                st.plotly_chart(fig_day, use_container_width=True, key="chart_day")
 
-    else:
-        st.warning("暂无有效数据")
+            with col_chart2:
+                fig_month = _pct_bar_fig(tuple(quotes_df['代码']), tuple(quotes_df['月涨跌幅%']), "本月涨跌幅 (%)")
+                st.plotly_chart(fig_month, use_container_width=True, key="chart_month")
+
+        else:
+            st.warning("暂无有效数据")
 
 # --- Tab 4: 股东与大户 ---
 with tab4:
-    st.subheader("👥 股东结构与大户交易")
-    if selected_ticker:
-        holders_data = utils.get_holders_data(selected_ticker)
+    # 未载入前不执行本Tab的网络与计算，切换其他控件不再触发无谓开销
+    if not st.session_state.get('tab4_loaded'):
+        if st.button('📥 载入股东数据', key='tab4_loaded_btn'):
+            st.session_state.tab4_loaded = True
+            st.rerun()
+    else:
+        st.subheader("👥 股东结构与大户交易")
+        if selected_ticker:
+            holders_data = get_holders_data_cached(selected_ticker)
         
-        # 1. 主要股东概况 (Major Holders)
-        st.markdown("#### 🏢 主要股东持股概况 (Major Holders)")
-        major = holders_data.get('major_holders')
-        if major is not None and not major.empty:
-            # Major holders usually returns a DF with 0, 1 columns. 0 is value, 1 is text description
-            try:
-                # Rename columns for clarity
-                # The raw data index is 0,1,2... and columns are [0, 1] usually
-                # 0 is the percentage/number, 1 is the description
-                major.columns = ["数值 (Value)", "描述 (Description)"]
-                
-                # Translate common descriptions
-                desc_map = {
-                    "% of Shares Held by All Insider": "内部人士持股比例 (Insider %)",
-                    "% of Shares Held by Institutions": "机构持股比例 (Inst. %)",
-                    "% of Float Held by Institutions": "机构持股占流通盘比例 (Inst. Float %)",
-                    "Number of Institutions Holding Shares": "持股机构数量 (Inst. Count)"
-                }
-                major["描述 (Description)"] = major["描述 (Description)"].map(lambda x: desc_map.get(x, x))
+            # 1. 主要股东概况 (Major Holders)
+            st.markdown("#### 🏢 主要股东持股概况 (Major Holders)")
+            major = holders_data.get('major_holders')
+            if major is not None and not major.empty:
+                # Major holders usually returns a DF with 0, 1 columns. 0 is value, 1 is text description
+                try:
+                    # Rename columns for clarity
+                    # The raw data index is 0,1,2... and columns are [0, 1] usually
+                    # 0 is the percentage/number, 1 is the description
+                    major.columns = ["数值 (Value)", "描述 (Description)"]
+                
+                    # Translate common descriptions
+                    desc_map = {
+                        "% of Shares Held by All Insider": "内部人士持股比例 (Insider %)",
+                        "% of Shares Held by Institutions": "机构持股比例 (Inst. %)",
+                        "% of Float Held by Institutions": "机构持股占流通盘比例 (Inst. Float %)",
+                        "Number of Institutions Holding Shares": "持股机构数量 (Inst. Count)"
+                    }
+                    major["描述 (Description)"] = major["描述 (Description)"].replace(desc_map)
                 
-                st.table(major)
-            except:
-                st.dataframe(major, use_container_width=True)
-        else:
-            st.info("暂无主要股东数据")
-            
-        st.markdown("---")
-
-        # 2. 机构持股 (Institutional Holders)
-        st.markdown("#### 🏦 前10大机构持股 (Top Institutional Holders)")
-        inst = holders_data.get('institutional_holders')
-        if inst is not None and not inst.empty:
-            # Translate column names
-            col_map_inst = {
-                "Holder": "持有机构 (Holder)",
-                "Shares": "持股数 (Shares)",
-                "Date Reported": "报告日期 (Date)",
-                "% Out": "持股比例 (%)",
-                "Value": "市值 (Value)"
-            }
-            inst = inst.rename(columns=col_map_inst)
-            
-            # Translate Holder Names if enabled (slow but requested)
-            if enable_translation and "持有机构 (Holder)" in inst.columns:
-                 inst["持有机构 (Holder)"] = inst["持有机构 (Holder)"].apply(lambda x: utils.translate_text(x) if isinstance(x, str) else x)
-
-            st.dataframe(inst, use_container_width=True)
-        else:
-            st.info("暂无机构持股数据")
+                    st.table(major)
+                except:
+                    st.dataframe(major, use_container_width=True)
+            else:
+                st.info("暂无主要股东数据")
             
-        st.markdown("---")
+            st.markdown("---")
 
-        # 3. 内部人士交易 (Insider Transactions)
-        st.markdown("#### 👔 内部人士交易 (Insider Transactions)")
-        insider = holders_data.get('insider_transactions')
-        if insider is not None and not insider.empty:
-            try:
+            # 2. 机构持股 (Institutional Holders)
+            st.markdown("#### 🏦 前10大机构持股 (Top Institutional Holders)")
+            inst = holders_data.get('institutional_holders')
+            if inst is not None and not inst.empty:
                 # Translate column names
-                col_map_insider = {
-                    "Insider": "内部人士 (Insider)",
-                    "Position": "职位 (Position)",
-                    "URL": "链接 (URL)",
-                    "Text": "描述 (Text)",
-                    "Start Date": "开始日期 (Start)",
-                    "Ownership": "所有权 (Ownership)",
-                    "Value": "市值 (Value)",
-                    "Shares": "股数 (Shares)"
+                col_map_inst = {
+                    "Holder": "持有机构 (Holder)",
+                    "Shares": "持股数 (Shares)",
+                    "Date Reported": "报告日期 (Date)",
+                    "% Out": "持股比例 (%)",
+                    "Value": "市值 (Value)"
                 }
-                # Filter/Rename columns if they exist
-                cols_to_keep = [c for c in insider.columns if c in col_map_insider or c in ['Insider', 'Relation', 'Date', 'Transaction', 'Value', 'Shares']]
-                insider_display = insider[cols_to_keep].copy()
-                
-                # Standardize some column names if they differ
-                insider_display = insider_display.rename(columns={
-                    "Relation": "职位 (Position)",
-                    "Date": "日期 (Date)",
-                    "Transaction": "交易类型 (Transaction)",
-                    **col_map_insider
-                })
-                
-                # --- Content Translation ---
-                
-                # 1. Position / Relation
-                if "职位 (Position)" in insider_display.columns:
-                    def translate_position(val):
-                        if not isinstance(val, str): return val
-                        val_lower = val.lower()
-                        # Use dict for common ones first
-                        if 'chief executive officer' in val_lower: return '首席执行官 (CEO)'
-                        if 'chief financial officer' in val_lower: return '首席财务官 (CFO)'
-                        if 'chief operating officer' in val_lower: return '首席运营官 (COO)'
-                        if 'chief technology officer' in val_lower: return '首席技术官 (CTO)'
-                        if 'vice president' in val_lower: return '副总裁'
-                        if 'president' in val_lower: return '总裁'
-                        if 'director' in val_lower: return '董事'
-                        if 'chairman' in val_lower: return '董事长'
-                        if 'secretary' in val_lower: return '秘书'
-                        if 'officer' in val_lower: return '高管'
-                        if '10% owner' in val_lower: return '持股10%以上大股东'
-                        
-                        # Fallback to AI translation if enabled
-                        if enable_translation:
-                            return utils.translate_text(val)
-                        return val
-                    
-                    insider_display["职位 (Position)"] = insider_display["职位 (Position)"].apply(translate_position)
-
-                # 2. Transaction Type
-                if "交易类型 (Transaction)" in insider_display.columns:
-                    trans_map = {
-                        'Buy': '买入',
-                        'Sell': '卖出',
-                        'Sale': '出售',
-                        'Purchase': '购买',
-                        'Option Exercise': '期权行权',
-                        'Grant': '授予',
-                        'Award': '奖励',
-                        'Gift': '赠与',
-                        'Automatic Sell': '自动卖出'
-                    }
-                    # Partial match or exact match? usually exact words in yfinance
-                    insider_display["交易类型 (Transaction)"] = insider_display["交易类型 (Transaction)"].map(lambda x: trans_map.get(x, x))
-
-                # 3. Ownership Type
-                if "所有权 (Ownership)" in insider_display.columns:
-                    own_map = {
-                        'Direct': '直接持有',
-                        'Indirect': '间接持有',
-                        'D': '直接',
-                        'I': '间接'
+                inst = inst.rename(columns=col_map_inst)
+            
+                # Translate Holder Names if enabled (slow but requested)
+                if enable_translation and "持有机构 (Holder)" in inst.columns:
+                     # 先去重再翻译，网络请求数取决于不同机构数而非行数
+                     unique_holders = inst["持有机构 (Holder)"].unique()
+                     holder_map = {u: translate_cached(u) for u in unique_holders if isinstance(u, str)}
+                     inst["持有机构 (Holder)"] = inst["持有机构 (Holder)"].map(lambda x: holder_map.get(x, x))
+
+                st.dataframe(inst, use_container_width=True)
+            else:
+                st.info("暂无机构持股数据")
+            
+            st.markdown("---")
+
+            # 3. 内部人士交易 (Insider Transactions)
+            st.markdown("#### 👔 内部人士交易 (Insider Transactions)")
+            insider = holders_data.get('insider_transactions')
+            if insider is not None and not insider.empty:
+                try:
+                    # Translate column names
+                    col_map_insider = {
+                        "Insider": "内部人士 (Insider)",
+                        "Position": "职位 (Position)",
+                        "URL": "链接 (URL)",
+                        "Text": "描述 (Text)",
+                        "Start Date": "开始日期 (Start)",
+                        "Ownership": "所有权 (Ownership)",
+                        "Value": "市值 (Value)",
+                        "Shares": "股数 (Shares)"
                     }
-                    insider_display["所有权 (Ownership)"] = insider_display["所有权 (Ownership)"].map(lambda x: own_map.get(x, x))
-                
-                st.dataframe(insider_display, use_container_width=True)
-            except:
-                st.dataframe(insider, use_container_width=True)
+                    # Filter/Rename columns if they exist
+                    cols_to_keep = [c for c in insider.columns if c in col_map_insider or c in ['Insider', 'Relation', 'Date', 'Transaction', 'Value', 'Shares']]
+                    insider_display = insider[cols_to_keep].copy()
+                
+                    # Standardize some column names if they differ
+                    insider_display = insider_display.rename(columns={
+                        "Relation": "职位 (Position)",
+                        "Date": "日期 (Date)",
+                        "Transaction": "交易类型 (Transaction)",
+                        **col_map_insider
+                    })
+                
+                    # --- Content Translation ---
+                
+                    # 1. Position / Relation
+                    if "职位 (Position)" in insider_display.columns:
+                        pos_col = insider_display["职位 (Position)"]
+                        pos_lower = pos_col.astype(str).str.lower()
+
+                        # 常见职位一次性向量化匹配 (顺序即优先级，如 vice president 先于 president)
+                        position_rules = [
+                            ('chief executive officer', '首席执行官 (CEO)'),
+                            ('chief financial officer', '首席财务官 (CFO)'),
+                            ('chief operating officer', '首席运营官 (COO)'),
+                            ('chief technology officer', '首席技术官 (CTO)'),
+                            ('vice president', '副总裁'),
+                            ('president', '总裁'),
+                            ('director', '董事'),
+                            ('chairman', '董事长'),
+                            ('secretary', '秘书'),
+                            ('officer', '高管'),
+                            ('10% owner', '持股10%以上大股东'),
+                        ]
+                        conditions = [pos_lower.str.contains(k, regex=False) for k, _ in position_rules]
+                        translated_pos = pd.Series(
+                            np.select(conditions, [v for _, v in position_rules], default=None),
+                            index=pos_col.index
+                        )
+
+                        # 只对未命中的少数行走AI翻译 (开启时)，其余保持原值
+                        unmatched = translated_pos.isna()
+                        if enable_translation and unmatched.any():
+                            translated_pos[unmatched] = pos_col[unmatched].map(
+                                lambda x: translate_cached(x) if isinstance(x, str) else x
+                            )
+                        else:
+                            translated_pos[unmatched] = pos_col[unmatched]
+
+                        insider_display["职位 (Position)"] = translated_pos
+
+                    # 2. Transaction Type
+                    if "交易类型 (Transaction)" in insider_display.columns:
+                        trans_map = {
+                            'Buy': '买入',
+                            'Sell': '卖出',
+                            'Sale': '出售',
+                            'Purchase': '购买',
+                            'Option Exercise': '期权行权',
+                            'Grant': '授予',
+                            'Award': '奖励',
+                            'Gift': '赠与',
+                            'Automatic Sell': '自动卖出'
+                        }
+                        # Partial match or exact match? usually exact words in yfinance
+                        insider_display["交易类型 (Transaction)"] = insider_display["交易类型 (Transaction)"].replace(trans_map)
+
+                    # 3. Ownership Type
+                    if "所有权 (Ownership)" in insider_display.columns:
+                        own_map = {
+                            'Direct': '直接持有',
+                            'Indirect': '间接持有',
+                            'D': '直接',
+                            'I': '间接'
+                        }
+                        insider_display["所有权 (Ownership)"] = insider_display["所有权 (Ownership)"].replace(own_map)
+                
+                    st.dataframe(insider_display, use_container_width=True)
+                except:
+                    st.dataframe(insider, use_container_width=True)
+            else:
+                st.info("暂无内部人士近期交易数据")
         else:
-            st.info("暂无内部人士近期交易数据")
-    else:
-        st.warning("请先选择股票")
+            st.warning("请先选择股票")
 with tab3:
-    st.subheader("📰 最新相关新闻")
-    if selected_ticker:
-        news = utils.get_news(selected_ticker)
-        if news:
-            # Translation warning/hint
-            if enable_translation:
-                 st.info("💡 已开启自动翻译，新闻标题将尝试显示为中文。")
+    # 未载入前不执行本Tab的网络与计算，切换其他控件不再触发无谓开销
+    if not st.session_state.get('tab3_loaded'):
+        if st.button('📥 载入市场动态', key='tab3_loaded_btn'):
+            st.session_state.tab3_loaded = True
+            st.rerun()
+    else:
+        st.subheader("📰 最新相关新闻")
+        if selected_ticker:
+            news = get_news_cached(selected_ticker)
+            if news:
+                # Translation warning/hint
+                if enable_translation:
+                     st.info("💡 已开启自动翻译，新闻标题将尝试显示为中文。")
                  
-            for n in news[:5]:
-                title = n.get('title', 'No Title')
+                top_news = news[:5]
+                titles = [n.get('title', 'No Title') for n in top_news]
                 if enable_translation:
-                    # Translate title
-                    title = utils.translate_text(title)
-                    
-                link = n.get('link', '#')
-                st.markdown(f"**[{title}]({link})**")
+                    # 5条标题合并为一次translate_batch请求
+                    titles = translate_many_cached(titles)
+
+                for n, title in zip(top_news, titles):
+                    link = n.get('link', '#')
+                    st.markdown(f"**[{title}]({link})**")
                 
-                publisher = n.get('publisher', 'Unknown')
-                # Handle time (timestamp or ISO string)
-                pub_time = n.get('pubDate') or n.get('providerPublishTime')
-                time_str = "Unknown"
+                    publisher = n.get('publisher', 'Unknown')
+                    # Handle time (timestamp or ISO string)
+                    pub_time = n.get('pubDate') or n.get('providerPublishTime')
+                    time_str = "Unknown"
                 
-                if pub_time:
-                    if isinstance(pub_time, int):
-                        time_str = datetime.fromtimestamp(pub_time).strftime('%Y-%m-%d %H:%M')
-                    else:
-                        # Simple cleanup for ISO string
-                        time_str = str(pub_time).replace('T', ' ').replace('Z', '')
+                    if pub_time:
+                        if isinstance(pub_time, int):
+                            time_str = datetime.fromtimestamp(pub_time).strftime('%Y-%m-%d %H:%M')
+                        else:
+                            # Simple cleanup for ISO string
+                            time_str = str(pub_time).replace('T', ' ').replace('Z', '')
                 
-                st.caption(f"来源: {publisher} | 发布时间: {time_str}")
-                st.markdown("---")
-        else:
-            st.write("暂无新闻数据。")
+                    st.caption(f"来源: {publisher} | 发布时间: {time_str}")
+                    st.markdown("---")
+            else:
+                st.write("暂无新闻数据。")
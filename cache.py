@@ -0,0 +1,87 @@
+import hashlib
+import os
+import pickle
+import time
+
+# 各类数据的刷新周期不同，按实际更新节奏设置TTL（秒）
+DEFAULT_TTLS = {
+    'info': 30 * 86400,        # 基本面信息 ~30天
+    'holders': 90 * 86400,     # 股东数据 按季度披露 ~90天
+    'news': 3600,              # 新闻 ~1小时
+    'exchange_rate': 6 * 3600, # 汇率 ~6小时
+    'search': 7 * 86400,       # 搜索结果 基本不变
+}
+
+
+class FileCache:
+    """
+    简单的磁盘TTL缓存
+    按 (ticker, endpoint) 存储在 .cache/{ticker}/{endpoint}.pkl
+    文件内容为 {"ts": 写入时间, "ttl": 有效期秒数, "data": 数据} 信封
+    """
+
+    def __init__(self, cache_dir='.cache'):
+        self.cache_dir = cache_dir
+
+    def _path(self, ticker, endpoint):
+        # 用MD5处理key，避免非法文件名字符
+        safe_ticker = hashlib.md5(str(ticker).encode('utf-8')).hexdigest()[:16]
+        safe_endpoint = hashlib.md5(str(endpoint).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, safe_ticker, f"{safe_endpoint}.pkl")
+
+    def get(self, ticker, endpoint):
+        """
+        读取缓存，命中返回数据；未命中或已过期返回None
+        """
+        path = self._path(ticker, endpoint)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                envelope = pickle.load(f)
+
+            if time.time() - envelope['ts'] > envelope['ttl']:
+                # 已过期，清除后让调用方重新获取
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                return None
+
+            return envelope['data']
+        except Exception as e:
+            # 缓存读取失败时降级到API调用，不影响主流程
+            print(f"Cache read error for {ticker}/{endpoint}: {e}")
+            return None
+
+    def set(self, ticker, endpoint, data, ttl=None):
+        """
+        写入缓存，ttl为None时按endpoint取默认值
+        """
+        if ttl is None:
+            ttl = DEFAULT_TTLS.get(endpoint, 3600)
+
+        path = self._path(ticker, endpoint)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            envelope = {'ts': time.time(), 'ttl': ttl, 'data': data}
+            with open(path, 'wb') as f:
+                pickle.dump(envelope, f)
+            return True
+        except Exception as e:
+            print(f"Cache write error for {ticker}/{endpoint}: {e}")
+            return False
+
+    def get_or_fetch(self, ticker, endpoint, fetch_fn, ttl=None):
+        """
+        命中缓存直接返回；未命中则调用fetch_fn获取并写入缓存
+        """
+        data = self.get(ticker, endpoint)
+        if data is not None:
+            return data
+
+        data = fetch_fn()
+        if data is not None:
+            self.set(ticker, endpoint, data, ttl=ttl)
+        return data
@@ -0,0 +1,267 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+    _HAS_NUMBA = True
+except ImportError:
+    # numba未安装时整体切换到下方else分支的pandas/NumPy向量化实现，
+    # 避免让标量递推循环跑在纯Python解释器里
+    _HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(fn):
+            return fn
+        return wrap
+
+
+# 显式签名让numba在import时即完成编译 (配合cache=True免去首调用抖动)，
+# 并为float32/float64两种输入各生成特化版本
+@njit(['float64[::1](float32[::1], int64)',
+       'float64[::1](float64[::1], int64)'],
+      cache=True, fastmath=True, boundscheck=False)
+def sma(arr, w):
+    """
+    简单移动平均 (cumsum滑窗，单次遍历)
+    """
+    out = np.full(arr.size, np.nan)
+    if arr.size < w:
+        return out
+    csum = np.cumsum(arr)
+    out[w - 1] = csum[w - 1] / w
+    out[w:] = (csum[w:] - csum[:-w]) / w
+    return out
+
+
+if _HAS_NUMBA:
+    @njit(['float64[::1](float32[::1], int64)',
+           'float64[::1](float64[::1], int64)'],
+          cache=True, fastmath=True, boundscheck=False)
+    def ema(arr, span):
+        """
+        指数移动平均 (adjust=False语义，与pandas ewm一致)
+        """
+        out = np.empty(arr.size)
+        if arr.size == 0:
+            return out
+        alpha = 2.0 / (span + 1.0)
+        out[0] = arr[0]
+        for i in range(1, arr.size):
+            out[i] = alpha * arr[i] + (1.0 - alpha) * out[i - 1]
+        return out
+
+    @njit(['float64[::1](float32[::1], int64)',
+           'float64[::1](float64[::1], int64)'],
+          cache=True, fastmath=True, boundscheck=False)
+    def rsi(arr, w=14):
+        """
+        相对强弱指标 (ta库口径: ewm(alpha=1/w, min_periods=w, adjust=False))
+        首个涨跌作种子，avg = (avg*(w-1) + 新值)/w 标量递推，
+        与无numba分支的pandas ewm实现逐值一致
+        """
+        out = np.full(arr.size, np.nan)
+        if arr.size <= w:
+            return out
+
+        diffs = np.diff(arr)
+        gains = np.where(diffs > 0, diffs, 0.0)
+        losses = np.where(diffs < 0, -diffs, 0.0)
+
+        avg_gain = gains[0]
+        avg_loss = losses[0]
+        for i in range(1, diffs.size):
+            avg_gain = (avg_gain * (w - 1) + gains[i]) / w
+            avg_loss = (avg_loss * (w - 1) + losses[i]) / w
+            if i >= w - 1:
+                if avg_loss == 0.0:
+                    out[i + 1] = 100.0
+                else:
+                    out[i + 1] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        return out
+
+    @njit(['UniTuple(float64[::1], 3)(float32[::1], int64, int64, int64)',
+           'UniTuple(float64[::1], 3)(float64[::1], int64, int64, int64)'],
+          cache=True, fastmath=True, boundscheck=False)
+    def macd(arr, fast=12, slow=26, signal=9):
+        """
+        MACD线、信号线、柱 (12/26/9)
+        """
+        macd_line = ema(arr, fast) - ema(arr, slow)
+        signal_line = ema(macd_line, signal)
+        return macd_line, signal_line, macd_line - signal_line
+
+    @njit(['UniTuple(float64[::1], 3)(float32[::1], int64, float64)',
+           'UniTuple(float64[::1], 3)(float64[::1], int64, float64)'],
+          cache=True, fastmath=True, boundscheck=False)
+    def bollinger(arr, w=20, ndev=2.0):
+        """
+        布林带上/中/下轨 (ddof=0，与ta库口径一致)
+        方差用 E[x^2] - E[x]^2，复用同一套滑窗均值
+        """
+        mid = sma(arr, w)
+        sq_mean = sma(arr * arr, w)
+        var = sq_mean - mid * mid
+        var = np.where(var > 0.0, var, 0.0)
+        std = np.sqrt(var)
+        return mid + ndev * std, mid, mid - ndev * std
+
+    @njit(['UniTuple(float64[::1], 9)(float32[::1])',
+           'UniTuple(float64[::1], 9)(float64[::1])'],
+          cache=True, fastmath=True, boundscheck=False)
+    def all_indicators(close):
+        """
+        单次遍历Close数组，同时产出全部指标
+        (SMA_20, SMA_50, BB_High, BB_Mid, BB_Low, RSI, MACD, MACD_Signal, MACD_Diff)
+        滑窗用加新减旧维护，EMA用递推式，一遍内存访问替代逐指标的6次遍历
+        """
+        n = close.size
+        sma20 = np.full(n, np.nan)
+        sma50 = np.full(n, np.nan)
+        bb_high = np.full(n, np.nan)
+        bb_mid = np.full(n, np.nan)
+        bb_low = np.full(n, np.nan)
+        rsi_out = np.full(n, np.nan)
+        macd_line = np.empty(n)
+        macd_signal = np.empty(n)
+        macd_diff = np.empty(n)
+
+        if n == 0:
+            return sma20, sma50, bb_high, bb_mid, bb_low, rsi_out, macd_line, macd_signal, macd_diff
+
+        a12 = 2.0 / 13.0
+        a26 = 2.0 / 27.0
+        a9 = 2.0 / 10.0
+        # 累加器统一提升为float64 (乘1.0)，float32输入下类型在循环内保持稳定
+        ema12 = close[0] * 1.0
+        ema26 = close[0] * 1.0
+        ema9 = 0.0
+        macd_line[0] = 0.0
+        macd_signal[0] = 0.0
+        macd_diff[0] = 0.0
+
+        sum20 = close[0] * 1.0
+        sumsq20 = close[0] * close[0] * 1.0
+        sum50 = close[0] * 1.0
+        avg_gain = 0.0
+        avg_loss = 0.0
+
+        for i in range(1, n):
+            x = close[i]
+
+            # EMA递推 (MACD 12/26/9)
+            ema12 = a12 * x + (1.0 - a12) * ema12
+            ema26 = a26 * x + (1.0 - a26) * ema26
+            m = ema12 - ema26
+            ema9 = a9 * m + (1.0 - a9) * ema9
+            macd_line[i] = m
+            macd_signal[i] = ema9
+            macd_diff[i] = m - ema9
+
+            # 20日滑窗和 + 平方和 (SMA_20与布林带共用)
+            sum20 += x
+            sumsq20 += x * x
+            if i >= 20:
+                old = close[i - 20]
+                sum20 -= old
+                sumsq20 -= old * old
+            if i >= 19:
+                mean20 = sum20 / 20.0
+                var20 = sumsq20 / 20.0 - mean20 * mean20
+                if var20 < 0.0:
+                    var20 = 0.0
+                std20 = np.sqrt(var20)
+                sma20[i] = mean20
+                bb_mid[i] = mean20
+                bb_high[i] = mean20 + 2.0 * std20
+                bb_low[i] = mean20 - 2.0 * std20
+
+            # 50日滑窗和
+            sum50 += x
+            if i >= 50:
+                sum50 -= close[i - 50]
+            if i >= 49:
+                sma50[i] = sum50 / 50.0
+
+            # RSI: ewm(alpha=1/14, adjust=False)口径，首个涨跌作种子 (与ta库及无numba分支一致)
+            d = x - close[i - 1]
+            g = d if d > 0.0 else 0.0
+            l = -d if d < 0.0 else 0.0
+            if i == 1:
+                avg_gain = g * 1.0
+                avg_loss = l * 1.0
+            else:
+                avg_gain = (avg_gain * 13.0 + g) / 14.0
+                avg_loss = (avg_loss * 13.0 + l) / 14.0
+            if i >= 14:
+                rsi_out[i] = 100.0 if avg_loss == 0.0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+        return sma20, sma50, bb_high, bb_mid, bb_low, rsi_out, macd_line, macd_signal, macd_diff
+
+else:
+    def ema(arr, span):
+        """
+        指数移动平均 (adjust=False语义)
+        无numba时走pandas ewm，递推在C层完成
+        """
+        return pd.Series(arr, dtype='float64').ewm(span=span, adjust=False).mean().to_numpy()
+
+    def rsi(arr, w=14):
+        """
+        相对强弱指标 (ta库口径: ewm(alpha=1/w, min_periods=w, adjust=False))
+        Wilder平滑交给pandas ewm，整条路径无Python循环
+        """
+        out = np.full(arr.size, np.nan)
+        if arr.size <= w:
+            return out
+
+        diffs = np.diff(np.asarray(arr, dtype=np.float64))
+        gains = np.where(diffs > 0, diffs, 0.0)
+        losses = np.where(diffs < 0, -diffs, 0.0)
+
+        alpha = 1.0 / w
+        avg_gain = pd.Series(gains).ewm(alpha=alpha, min_periods=w, adjust=False).mean().to_numpy()
+        avg_loss = pd.Series(losses).ewm(alpha=alpha, min_periods=w, adjust=False).mean().to_numpy()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vals = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        out[1:] = np.where(avg_loss == 0.0, 100.0, vals)
+        return out
+
+    def macd(arr, fast=12, slow=26, signal=9):
+        """
+        MACD线、信号线、柱 (12/26/9)
+        """
+        macd_line = ema(arr, fast) - ema(arr, slow)
+        signal_line = ema(macd_line, signal)
+        return macd_line, signal_line, macd_line - signal_line
+
+    def bollinger(arr, w=20, ndev=2.0):
+        """
+        布林带上/中/下轨 (ddof=0，与ta库口径一致)
+        sliding_window_view一次性生成全部窗口视图，mean/std都是C层循环
+        """
+        mid = np.full(arr.size, np.nan)
+        std = np.full(arr.size, np.nan)
+        if arr.size >= w:
+            windows = sliding_window_view(np.asarray(arr, dtype=np.float64), w)
+            mid[w - 1:] = windows.mean(axis=1)
+            std[w - 1:] = windows.std(axis=1, ddof=0)
+        return mid + ndev * std, mid, mid - ndev * std
+
+    def all_indicators(close):
+        """
+        产出全部指标，顺序与numba版融合核一致
+        (SMA_20, SMA_50, BB_High, BB_Mid, BB_Low, RSI, MACD, MACD_Signal, MACD_Diff)
+        无numba时由各向量化实现组合，逐指标多遍遍历换取C层执行
+        """
+        close = np.asarray(close, dtype=np.float64)
+        sma20 = sma(close, 20)
+        sma50 = sma(close, 50)
+        bb_high, bb_mid, bb_low = bollinger(close, 20, 2.0)
+        macd_line, macd_signal, macd_diff = macd(close, 12, 26, 9)
+        rsi_out = rsi(close, 14)
+        return sma20, sma50, bb_high, bb_mid, bb_low, rsi_out, macd_line, macd_signal, macd_diff
@@ -1,33 +1,103 @@
 import yfinance as yf
 import pandas as pd
-import ta
+import numpy as np
+import indicators
 import json
 import os
+import re
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from deep_translator import GoogleTranslator
+from _cache import get_or_fetch
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ... existing imports ...
 
+# 新浪接口复用同一个Session：keep-alive省掉每次请求的TCP握手
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=20, pool_maxsize=20,
+    max_retries=Retry(total=2, backoff_factor=0.2)
+)
+_session.mount('http://', _adapter)
+_session.mount('https://', _adapter)
+_session.headers.update({
+    'User-Agent': 'Mozilla/5.0',
+    'Referer': 'http://finance.sina.com.cn/',
+})
+
+# 预编译的新浪响应解析正则：对原始字节做单次C层扫描，替代逐行多次split
+_SINA_HQ_RE = re.compile(rb'hq_str_(hk\d+)="([^"]*)"')
+_SINA_SUGGEST_RE = re.compile(rb'="([^"]*)"')
+
+def fetch_many(tickers, fn, max_workers=10):
+    """
+    并发执行fn(ticker)，返回 {ticker: 结果}
+    网络I/O在等待期间释放GIL，线程池可以让多个请求重叠
+    """
+    if not tickers:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tickers))) as ex:
+        return dict(zip(tickers, ex.map(fn, tickers)))
+
+@lru_cache(maxsize=8)
+def _translator(target):
+    """
+    按目标语言复用GoogleTranslator实例：构造时会做语言校验和URL/headers准备，
+    每次翻译都重建纯属浪费
+    """
+    return GoogleTranslator(source='auto', target=target)
+
+@lru_cache(maxsize=10000)
+def _cached_translate(text, target):
+    return _translator(target).translate(text)
+
 def translate_text(text, target='zh-CN'):
     """
-    翻译文本
+    翻译文本 (进程内按文本记忆化，重复字符串不再重复请求)
     """
     if not text or not isinstance(text, str):
         return text
-    
+
     try:
-        # Use simple mapping for common words to save API calls and time
-        # This is a basic optimization
-        if len(text) < 20:
-            # Add simple dict check here if needed
-            pass
-            
-        translator = GoogleTranslator(source='auto', target=target)
-        return translator.translate(text)
+        return _cached_translate(text, target)
     except Exception as e:
         print(f"Translation error: {e}")
         return text
 
+def translate_many(texts, target='zh-CN'):
+    """
+    批量翻译：去重后一次translate_batch请求，替代逐条N次往返
+    输入顺序保持不变，失败时原样返回
+    """
+    if not texts:
+        return []
+
+    seen = set()
+    unique = []
+    for t in texts:
+        if t and isinstance(t, str) and t not in seen:
+            seen.add(t)
+            unique.append(t)
+
+    mapping = {}
+    if unique:
+        try:
+            translated = _translator(target).translate_batch(unique)
+            mapping = dict(zip(unique, translated))
+        except Exception as e:
+            print(f"Batch translation error: {e}")
+
+    return [mapping.get(t, t) if isinstance(t, str) else t for t in texts]
+
 def load_tickers_from_json(file_path='tickers.json'):
     """
     从JSON文件加载股票代码
@@ -36,9 +106,11 @@ def load_tickers_from_json(file_path='tickers.json'):
         return None
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('tickers', [])
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        # orjson解析快数倍；未安装时退回stdlib
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        return data.get('tickers', [])
     except Exception as e:
         print(f"Error loading tickers: {e}")
         return None
@@ -61,14 +133,23 @@ def save_tickers_to_json(tickers, file_path='tickers.json'):
             # If user wants info saved, we might need a separate function or file.
             # Let's stick to saving codes for persistence first.
             pass
-            
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+
+        if orjson is not None:
+            # orjson直接产出UTF-8字节，跳过Python层的字符串转义
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
         return True
     except Exception as e:
         print(f"Error saving tickers: {e}")
         return False
 
+# 统一匹配纯数字代码 (可带.HK后缀)，一次match替代replace+int的分支逻辑
+_HK_RE = re.compile(r'^0*(\d+)(?:\.HK)?$', re.I)
+
+@lru_cache(maxsize=2048)
 def format_hk_ticker(ticker):
     """
     格式化港股代码为 Yahoo Finance 可识别的格式
@@ -76,68 +157,108 @@ def format_hk_ticker(ticker):
          "00700" -> "0700.HK"
          "700" -> "0700.HK"
          "0700.HK" -> "0700.HK"
+    同一代码在各函数间反复使用，lru_cache后热路径只剩一次字典查找
     """
-    # 移除可能的 .HK 后缀进行处理
-    base_code = ticker.replace('.HK', '').strip()
-    
-    # 尝试转为整数再格式化为4位
-    try:
-        code_int = int(base_code)
+    # 快路径：绝大多数输入是<=4位纯数字，zfill直达，不进正则和int解析
+    s = ticker[:-3] if ticker.endswith('.HK') else ticker
+    s = s.strip()
+    if s.isdigit() and len(s) <= 4:
+        return s.zfill(4) + '.HK'
+
+    m = _HK_RE.match(ticker.strip())
+    if m:
         # 港股一般是4位，Yahoo Finance 要求至少4位
-        # 如 0005 -> 0005.HK
-        # 如 700 -> 0700.HK
-        # 如 1810 -> 1810.HK
-        # 如 9988 -> 9988.HK
-        formatted_code = f"{code_int:04d}.HK"
-        return formatted_code
-    except ValueError:
-        # 如果无法转为整数，原样返回（可能包含非数字字符）
-        if not ticker.endswith('.HK'):
-            return f"{ticker}.HK"
-        return ticker
-
-def get_stock_data(ticker, period="1y", interval="1d"):
+        return f"{int(m.group(1)):04d}.HK"
+
+    # 无法解析为数字时原样返回（可能包含非数字字符）
+    if not ticker.endswith('.HK'):
+        return f"{ticker}.HK"
+    return ticker
+
+@lru_cache(maxsize=1024)
+def _ticker(symbol):
+    """
+    复用yf.Ticker对象：同一代码在一个渲染周期内被多个函数使用，
+    重建对象会丢掉内部的session/cookie状态
+    """
+    return yf.Ticker(symbol)
+
+def get_stock_data(ticker, period="1y", interval="1d", force=False):
     """
     获取股票历史数据
     ticker: 股票代码
     period: 时间周期 (e.g., '1y', '1mo', 'max')
     interval: 时间粒度 (e.g., '1d', '1h', '15m')
+    force: True时绕过缓存强制重新拉取（用于用户手动刷新）
     """
     ticker = format_hk_ticker(ticker)
-    
-    stock = yf.Ticker(ticker)
+
+    stock = _ticker(ticker)
     try:
-        df = stock.history(period=period, interval=interval)
-        if df.empty:
+        # 分钟级数据60秒过期，日级及以上1小时；重复渲染直接走磁盘缓存
+        ttl = 60 if interval.endswith('m') else 3600
+        key = f"hist:{ticker}:{period}:{interval}"
+        df = get_or_fetch(key, ttl, lambda: stock.history(period=period, interval=interval),
+                          force=force)
+        if df is None or df.empty:
             return None
         return df
     except Exception as e:
         print(f"Error getting data for {ticker}: {e}")
         return None
 
+def get_stock_data_multi(tickers, period="1mo", interval="1d"):
+    """
+    批量获取多只股票历史数据
+    一次yf.download(threads=True)替代N次Ticker.history的串行往返
+    返回: dict {原始代码: DataFrame或None}
+    """
+    if not tickers:
+        return {}
+
+    formatted = {t: format_hk_ticker(t) for t in tickers}
+    try:
+        df = yf.download(
+            " ".join(formatted.values()),
+            period=period, interval=interval,
+            group_by='ticker', threads=True, progress=False
+        )
+    except Exception as e:
+        print(f"Error batch downloading data: {e}")
+        return {t: None for t in tickers}
+
+    results = {}
+    for t, sym in formatted.items():
+        try:
+            # 新版yfinance对单只股票也可能保留ticker层级，按列结构判断而不是数量
+            sub = df[sym] if isinstance(df.columns, pd.MultiIndex) else df
+            sub = sub.dropna(how='all')
+            results[t] = sub if not sub.empty else None
+        except Exception:
+            results[t] = None
+    return results
+
 def get_holders_data(ticker):
     """
     获取股东相关数据
     """
     ticker = format_hk_ticker(ticker)
-    stock = yf.Ticker(ticker)
-    
+    stock = _ticker(ticker)
+
+    # 三个属性各自触发一次HTTP请求，互相独立，并发获取
     data = {}
-    try:
-        data['major_holders'] = stock.major_holders
-    except:
-        pass
-        
-    try:
-        data['institutional_holders'] = stock.institutional_holders
-    except:
-        pass
-        
-    try:
-        data['insider_transactions'] = stock.insider_transactions
-    except:
-        pass
-        
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        futures = {
+            'major_holders': ex.submit(lambda: stock.major_holders),
+            'institutional_holders': ex.submit(lambda: stock.institutional_holders),
+            'insider_transactions': ex.submit(lambda: stock.insider_transactions),
+        }
+        for key, future in futures.items():
+            try:
+                data[key] = future.result()
+            except:
+                pass
+
     return data
 
 def get_stock_info(ticker):
@@ -146,7 +267,7 @@ def get_stock_info(ticker):
     """
     ticker = format_hk_ticker(ticker)
     
-    stock = yf.Ticker(ticker)
+    stock = _ticker(ticker)
     try:
         return stock.info
     except Exception:
@@ -158,39 +279,30 @@ def calculate_technical_indicators(df):
     """
     if df is None or df.empty:
         return df
-    
-    # Simple Moving Averages
-    df['SMA_20'] = ta.trend.sma_indicator(df['Close'], window=20)
-    df['SMA_50'] = ta.trend.sma_indicator(df['Close'], window=50)
-    
-    # Bollinger Bands
-    bb_indicator = ta.volatility.BollingerBands(close=df["Close"], window=20, window_dev=2)
-    df['BB_High'] = bb_indicator.bollinger_hband()
-    df['BB_Low'] = bb_indicator.bollinger_lband()
-    df['BB_Mid'] = bb_indicator.bollinger_mavg()
-    
-    # RSI
-    df['RSI'] = ta.momentum.rsi(df['Close'], window=14)
-    
-    # MACD
-    macd = ta.trend.MACD(df['Close'])
-    df['MACD'] = macd.macd()
-    df['MACD_Signal'] = macd.macd_signal()
-    df['MACD_Diff'] = macd.macd_diff()
-    
-    return df
 
-def get_news(ticker):
-    """
-    获取新闻并标准化格式
-    """
-    ticker = format_hk_ticker(ticker)
-    
-    stock = yf.Ticker(ticker)
-    try:
-        raw_news = stock.news
-    except Exception:
-        return []
+    # 指标计算用不到双精度，OHLC先降为float32，滑窗操作搬运的字节数减半
+    for c in ('Open', 'High', 'Low', 'Close'):
+        if c in df.columns:
+            df[c] = df[c].astype('float32', copy=False)
+
+    # 一次性取出Close数组，单个融合内核一遍算完全部指标
+    close = df['Close'].to_numpy(dtype=np.float32)
+
+    (sma20, sma50, bb_high, bb_mid, bb_low,
+     rsi, macd_line, macd_signal, macd_diff) = indicators.all_indicators(close)
+
+    # 输出列同样保持float32
+    df['SMA_20'] = sma20.astype(np.float32, copy=False)
+    df['SMA_50'] = sma50.astype(np.float32, copy=False)
+    df['BB_High'] = bb_high.astype(np.float32, copy=False)
+    df['BB_Low'] = bb_low.astype(np.float32, copy=False)
+    df['BB_Mid'] = bb_mid.astype(np.float32, copy=False)
+    df['RSI'] = rsi.astype(np.float32, copy=False)
+    df['MACD'] = macd_line.astype(np.float32, copy=False)
+    df['MACD_Signal'] = macd_signal.astype(np.float32, copy=False)
+    df['MACD_Diff'] = macd_diff.astype(np.float32, copy=False)
+
+    return df
 
 def get_stock_names_sina(tickers):
     """
@@ -219,123 +331,143 @@ def get_stock_names_sina(tickers):
         return {}
         
     # Batch query (limit usually around 800 chars url, let's chunk safely)
-    results = {}
+    # 各chunk相互独立，并发拉取后合并结果
     chunk_size = 20
-    for i in range(0, len(sina_codes), chunk_size):
-        chunk = sina_codes[i:i+chunk_size]
-        query_list = ",".join(chunk)
-        url = f"http://hq.sinajs.cn/list={query_list}"
-        headers = {'Referer': 'http://finance.sina.com.cn/'}
-        
-        try:
-            resp = requests.get(url, headers=headers)
-            # encoding might be GBK
-            resp.encoding = 'gbk'
-            text = resp.text
-            
-            lines = text.strip().split('\n')
-            for line in lines:
-                # var hq_str_hk00700="TENCENT,腾讯控股,..."
-                if '="' in line:
-                    parts = line.split('="')
-                    if len(parts) < 2: continue
-                    
-                    lhs = parts[0] # var hq_str_hk00700
-                    rhs = parts[1].strip('";') # TENCENT,腾讯控股,...
-                    
-                    if not rhs: continue
-                    
-                    # Extract sina code from lhs
-                    # var hq_str_hk00700 -> hk00700
-                    current_sina_code = lhs.split('hq_str_')[-1]
-                    
-                    data_parts = rhs.split(',')
-                    if len(data_parts) > 1:
-                        cn_name = data_parts[1]
-                        # Map back to original ticker
-                        original_ticker = code_map.get(current_sina_code)
-                        if original_ticker:
-                            results[original_ticker] = cn_name
-        except Exception as e:
-            print(f"Error fetching names from Sina: {e}")
-            
+    chunks = [sina_codes[i:i+chunk_size] for i in range(0, len(sina_codes), chunk_size)]
+
+    results = {}
+    if len(chunks) == 1:
+        results.update(_fetch_sina_chunk(chunks[0], code_map))
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, len(chunks))) as ex:
+            for chunk_result in ex.map(lambda c: _fetch_sina_chunk(c, code_map), chunks):
+                results.update(chunk_result)
+
     return results
 
+def _fetch_sina_chunk(chunk, code_map):
+    """
+    拉取并解析一批新浪行情代码 (每批<=20个)
+    返回: dict {原始代码: 中文名}
+    """
+    query_list = ",".join(chunk)
+    url = f"http://hq.sinajs.cn/list={query_list}"
+
+    chunk_results = {}
+    try:
+        resp = _session.get(url, timeout=5, stream=True)
+        # var hq_str_hk00700="TENCENT,腾讯控股,..."
+        # 流式逐行消费，不整体materialize响应体；
+        # 行内仍用预编译正则匹配原始字节，只对名称字段做GBK解码
+        for raw_line in resp.iter_lines():
+            m = _SINA_HQ_RE.search(raw_line)
+            if not m:
+                continue
+            sina_code = m.group(1).decode('ascii')
+            fields = m.group(2).split(b',')
+            if len(fields) > 1:
+                # Map back to original ticker
+                original_ticker = code_map.get(sina_code)
+                if original_ticker:
+                    chunk_results[original_ticker] = fields[1].decode('gbk', errors='replace')
+    except Exception as e:
+        print(f"Error fetching names from Sina: {e}")
+
+    return chunk_results
+
 def get_news(ticker):
     """
     获取新闻并标准化格式
     """
     ticker = format_hk_ticker(ticker)
     
-    stock = yf.Ticker(ticker)
+    stock = _ticker(ticker)
     try:
         raw_news = stock.news
     except Exception:
         return []
     
-    processed_news = []
-    if raw_news:
-        for item in raw_news:
-            # Handle new yfinance structure (nested in 'content')
-            if 'content' in item:
-                c = item['content']
-                title = c.get('title', 'No Title')
-                
-                # Try to find link in various places
-                click_through = c.get('clickThroughUrl')
-                if click_through:
-                    link = click_through.get('url', '')
-                else:
-                    link = ''
-                    
-                if not link:
-                    canonical = c.get('canonicalUrl')
-                    if canonical:
-                        link = canonical.get('url', '')
-                
-                provider = c.get('provider')
-                if provider:
-                    publisher = provider.get('displayName', 'Unknown')
-                else:
-                    publisher = 'Unknown'
-                    
-                pub_time = c.get('pubDate', '') 
-                
-                processed_news.append({
-                    'title': title,
-                    'link': link,
-                    'publisher': publisher,
-                    'pubDate': pub_time, # ISO string
-                    'is_new_format': True
-                })
-            else:
-                # Old structure
-                processed_news.append({
-                    'title': item.get('title', 'No Title'),
-                    'link': item.get('link', ''),
-                    'publisher': item.get('publisher', 'Unknown'),
-                    'providerPublishTime': item.get('providerPublishTime', 0),
-                    'is_new_format': False
-                })
-                
+    if not raw_news:
+        return []
+
+    # 先按新旧格式分流，再各用一个列表推导式构建，省去逐条分支判断
+    new_items = [item['content'] for item in raw_news if 'content' in item]
+    old_items = [item for item in raw_news if 'content' not in item]
+
+    # Handle new yfinance structure (nested in 'content')
+    processed_news = [
+        {
+            'title': c.get('title', 'No Title'),
+            # Try to find link in various places
+            'link': (c.get('clickThroughUrl') or {}).get('url', '')
+                    or (c.get('canonicalUrl') or {}).get('url', ''),
+            'publisher': (c.get('provider') or {}).get('displayName', 'Unknown'),
+            'pubDate': c.get('pubDate', ''), # ISO string
+            'is_new_format': True
+        }
+        for c in new_items
+    ]
+
+    # Old structure
+    processed_news += [
+        {
+            'title': item.get('title', 'No Title'),
+            'link': item.get('link', ''),
+            'publisher': item.get('publisher', 'Unknown'),
+            'providerPublishTime': item.get('providerPublishTime', 0),
+            'is_new_format': False
+        }
+        for item in old_items
+    ]
+
     return processed_news
 
+# 常用货币对一次批量抓取：进程内快照缓存 (value, 过期时间)，TTL 10分钟
+_FX_PAIRS = ("HKDCNY=X", "CNYHKD=X", "USDCNY=X", "USDHKD=X")
+_fx_cache = {}
+
+def _refresh_fx_cache():
+    """
+    一次yf.download拉全部常用货币对，替代逐对的串行history请求
+    """
+    df = yf.download(
+        " ".join(_FX_PAIRS),
+        period="1d", threads=True, progress=False
+    )['Close']
+    last = df.iloc[-1]
+    expiry = time.time() + 600
+    for p in _FX_PAIRS:
+        rate = last[p] if len(_FX_PAIRS) > 1 else last
+        if rate == rate:  # 跳过NaN
+            _fx_cache[p] = (float(rate), expiry)
+
 def get_exchange_rate(from_currency="HKD", to_currency="CNY"):
     """
     获取汇率
     """
     if from_currency == to_currency:
         return 1.0
-        
+
     pair = f"{from_currency}{to_currency}=X"
     try:
-        ticker = yf.Ticker(pair)
-        hist = ticker.history(period="1d")
-        if not hist.empty:
-            return hist['Close'].iloc[-1]
+        cached = _fx_cache.get(pair)
+        if cached is not None and cached[1] > time.time():
+            return cached[0]
+
+        if pair in _FX_PAIRS:
+            _refresh_fx_cache()
+            cached = _fx_cache.get(pair)
+            if cached is not None:
+                return cached[0]
+        else:
+            # 非常用货币对走单独请求，仍经sqlite缓存
+            ticker = _ticker(pair)
+            hist = get_or_fetch(f"fx:{pair}", 600, lambda: ticker.history(period="1d"))
+            if hist is not None and not hist.empty:
+                return hist['Close'].iloc[-1]
     except Exception:
         pass
-    
+
     # Fallback/Default values if fetch fails (approximate)
     if from_currency == "HKD" and to_currency == "CNY":
         return 0.92
@@ -350,19 +482,17 @@ def search_stock_sina(query):
     返回: list of (name, code)
     """
     url = f"http://suggest3.sinajs.cn/suggest/type=31&key={query}&name=suggest_data"
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    
+
     try:
-        response = requests.get(url, headers=headers)
-        response.encoding = 'gbk'
-        text = response.text
-        
+        response = _session.get(url, timeout=5)
+
         # Parse: var suggest_data="腾讯控股,31,00700,00700,...;..."
-        if '="' in text:
-            content = text.split('="')[1].strip('";')
+        m = _SINA_SUGGEST_RE.search(response.content)
+        if m:
+            content = m.group(1).decode('gbk', errors='replace')
             if not content:
                 return []
-            
+
             results = []
             items = content.split(';')
             for item in items: